@@ -1,9 +1,16 @@
 from flask import Flask, Response, stream_with_context, request
 import json
+import orjson
+import msgspec
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 import opengradient as og
-from sseclient import SSEClient
+import aiohttp
+import asyncio
 import threading
 import logging
+import functools
 from typing import Dict, Any
 import os
 import queue
@@ -12,7 +19,7 @@ from datetime import datetime
 from logging.handlers import RotatingFileHandler
 import traceback
 import time
-import requests
+import httpx
 from vertexai.preview.generative_models import GenerativeModel
 import vertexai
 
@@ -46,6 +53,13 @@ class Config:
     SOURCE = index_config['source']
     PROMPT = index_config['prompt']
     PROJECT_ID = project_config['project_id']
+# Outbound LLM calls run on this bounded pool so a single stalled SDK call
+# (neither og.llm_completion nor generate_content takes a timeout) cannot
+# block its caller past LLM_CALL_TIMEOUT, and total outbound concurrency
+# stays capped
+LLM_EXEC = ThreadPoolExecutor(max_workers=16)
+LLM_CALL_TIMEOUT = 20  # seconds
+
 class LLMProvider:
     def __init__(self):
         self.providers = {
@@ -58,21 +72,70 @@ class LLMProvider:
                 'parse': self._parse_gemini_response
             }
         }
-        try:
-            # Set Google credentials from decrypted config
-            google_creds_path = 'config/google.json'
-            if os.path.exists(google_creds_path):
-                os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = google_creds_path
-            
-            vertexai.init(
-                project=os.getenv('GOOGLE_CLOUD_PROJECT', Config.PROJECT_ID),
-                location='us-central1'
-            )
-        except Exception as e:
-            logger.error(f"Failed to initialize Vertex AI: {str(e)}")
-            raise
+        # Set Google credentials from decrypted config
+        google_creds_path = 'config/google.json'
+        if os.path.exists(google_creds_path):
+            os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = google_creds_path
+
+        # Both SDKs do blocking auth/network work at init; defer each until
+        # the first call that needs it so the app can bind immediately on
+        # cold start instead of paying both inits before serving
+        self._vertex_ready = False
+        self._vertex_lock = threading.Lock()
+        self._og_ready = False
+        self._og_lock = threading.Lock()
+
+        # LRU cache of parsed responses keyed on (provider, sha256(prompt)) so
+        # duplicate prompts (replayed casts, SSE reconnects) skip the LLM call.
+        # Guarded by a lock because process_update runs on the SSE router thread.
+        self._resp_cache: OrderedDict = OrderedDict()
+        self._resp_cache_max = 1024
+        self._resp_cache_lock = threading.Lock()
+
+        # Reuse one GenerativeModel per model name so each call shares the
+        # same client and channel instead of rebuilding them per request
+        self._gemini_models: dict[str, GenerativeModel] = {}
+        self._gemini_generation_config = {
+            'max_output_tokens': 512,
+            'temperature': 0.2,
+            'top_p': 0.95
+        }
+
+    def _ensure_vertex(self) -> None:
+        if self._vertex_ready:
+            return
+        with self._vertex_lock:
+            if self._vertex_ready:
+                return
+            try:
+                vertexai.init(
+                    project=os.getenv('GOOGLE_CLOUD_PROJECT', Config.PROJECT_ID),
+                    location='us-central1'
+                )
+            except Exception as e:
+                logger.error(f"Failed to initialize Vertex AI: {str(e)}")
+                raise
+            self._vertex_ready = True
+
+    def _ensure_og(self) -> None:
+        if self._og_ready:
+            return
+        with self._og_lock:
+            if self._og_ready:
+                return
+            try:
+                og.init(
+                    email=Config.OG_EMAIL,
+                    password=Config.OG_PASSWORD,
+                    private_key=Config.OG_PRIVATE_KEY
+                )
+            except Exception as e:
+                logger.error(f"Failed to initialize OpenGradient: {str(e)}")
+                raise
+            self._og_ready = True
 
     def _call_opengradient(self, prompt: str) -> tuple[str, str]:
+        self._ensure_og()
         tx_hash, response = og.llm_completion(
             model_cid='meta-llama/Meta-Llama-3-8B-Instruct',
             prompt=prompt,
@@ -83,25 +146,47 @@ class LLMProvider:
         return tx_hash, response
 
     def _call_gemini(self, prompt: str) -> tuple[str, str]:
-        model = GenerativeModel('gemini-1.5-pro-002')
-        generation_config = {
-            'max_output_tokens': 512,
-            'temperature': 0.2,
-            'top_p': 0.95
-        }
-        
+        self._ensure_vertex()
+        model_name = 'gemini-1.5-pro-002'
+        # get-then-insert: setdefault would still construct a throwaway
+        # GenerativeModel on every call even after the first
+        model = self._gemini_models.get(model_name)
+        if model is None:
+            model = self._gemini_models[model_name] = GenerativeModel(model_name)
+
         response = model.generate_content(
             prompt,
-            generation_config=generation_config
+            generation_config=self._gemini_generation_config
         )
         return 'gemini', response.text
 
     def get_completion(self, provider: str, prompt: str) -> tuple[str, str]:
         if provider not in self.providers:
             raise ValueError(f"Unknown provider: {provider}")
-        
-        tx_hash, response = self.providers[provider]['call'](prompt)
+
+        key = (provider, hashlib.sha256(prompt.encode()).digest())
+        with self._resp_cache_lock:
+            if key in self._resp_cache:
+                self._resp_cache.move_to_end(key)
+                logger.info(f"Response cache hit for provider: {provider}")
+                return self._resp_cache[key]
+
+        future = LLM_EXEC.submit(self.providers[provider]['call'], prompt)
+        try:
+            tx_hash, response = future.result(timeout=LLM_CALL_TIMEOUT)
+        except FutureTimeoutError:
+            future.cancel()
+            raise TimeoutError(
+                f"{provider} completion timed out after {LLM_CALL_TIMEOUT}s"
+            )
         parsed_response = self.providers[provider]['parse'](response)
+
+        with self._resp_cache_lock:
+            self._resp_cache[key] = (tx_hash, parsed_response)
+            self._resp_cache.move_to_end(key)
+            while len(self._resp_cache) > self._resp_cache_max:
+                self._resp_cache.popitem(last=False)
+
         return tx_hash, parsed_response
 
     @staticmethod
@@ -110,23 +195,92 @@ class LLMProvider:
         response = response + '}'
         return response
 
+    _JSON_FENCE = '```json'
+    _FENCE = '```'
+
     @staticmethod
     def _parse_gemini_response(response: str) -> str:
         """Parse Gemini response which may include markdown code blocks."""
-        # Remove markdown code blocks if present
-        if '```json' in response:
-            response = response.split('```json')[-1].split('```')[0]
+        # Remove markdown code blocks if present; partition stops at its
+        # delimiter instead of building a list of every segment like split
+        if LLMProvider._JSON_FENCE in response:
+            response = response.rpartition(LLMProvider._JSON_FENCE)[2]
+            response = response.partition(LLMProvider._FENCE)[0]
         return response.strip()
 
+# One persistent HTTP/2 client for the IPFS prompt fetches: repeat requests
+# multiplex over a warm connection instead of paying a new TCP+TLS handshake
+# each time
+HTTP = httpx.Client(
+    http2=True,
+    timeout=httpx.Timeout(30.0, read=None),
+    limits=httpx.Limits(max_keepalive_connections=8)
+)
+
+_BASE_PROMPT_TTL = 600  # seconds before the cached base prompt is refetched
+_base_prompt_cache: Dict[str, tuple] = {}
+
+def _fetch_base_prompt(cid: str) -> str:
+    """Fetch the base prompt from IPFS, caching the text for _BASE_PROMPT_TTL seconds.
+
+    The prompt body is effectively immutable for a given CID, so the common
+    case is a dict lookup instead of a network round-trip per update.
+    """
+    cached = _base_prompt_cache.get(cid)
+    if cached and time.time() - cached[0] < _BASE_PROMPT_TTL:
+        return cached[1]
+
+    response = HTTP.get(f"https://ipfs.index.network/files/{cid}")
+    response.raise_for_status()
+    _base_prompt_cache[cid] = (time.time(), response.text)
+    return response.text
+
+def _find_json_span(buf: bytes) -> tuple[int, int] | None:
+    """Locate the first balanced top-level JSON object in buf.
+
+    Tracks brace depth with string/escape state so braces inside string
+    values or surrounding prose do not skew the span. Returns (start, end)
+    slice indices, or None if no balanced object is found.
+    """
+    depth = 0
+    in_string = False
+    escaped = False
+    start = -1
+
+    for i, byte in enumerate(buf):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif byte == 0x5C:  # backslash
+                escaped = True
+            elif byte == 0x22:  # double quote
+                in_string = False
+        elif byte == 0x22 and depth:
+            in_string = True
+        elif byte == 0x7B:  # {
+            if depth == 0:
+                start = i
+            depth += 1
+        elif byte == 0x7D and depth:  # }
+            depth -= 1
+            if depth == 0:
+                return start, i + 1
+
+    return None
+
 class UpdateProcessor:
     def __init__(self):
         self.active_routers = {}
+        # Guards active_routers: mutated by the Flask request threads while
+        # the SSE router thread iterates it
+        self.routers_lock = threading.RLock()
         self.llm_provider = LLMProvider()
 
     def evaluate_update(self, prompt: str, update: Dict[str, Any]) -> Dict[str, Any]:
         """Evaluate an update using specified LLM provider."""
-        logger.info(f"Starting evaluation for prompt: {prompt[:100]}...")
-        logger.info(f"Update content: {json.dumps(update, indent=2)}")
+        logger.info("Starting evaluation for prompt: %.100s...", prompt)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Update content: %s", orjson.dumps(update).decode())
         try:
             author_name = update['author'].get('name') or update['author']['username']
             update_prompt = self._build_prompt(prompt, update, author_name)
@@ -136,11 +290,12 @@ class UpdateProcessor:
             provider = os.getenv('LLM_PROVIDER', 'gemini')
             logger.info(f"Using LLM provider: {provider}")
             tx_hash, response = self.llm_provider.get_completion(provider, update_prompt)
-            logger.info(f"LLM response: {response}")
+            logger.debug("LLM response: %s", response)
 
             result = self._parse_response(response)
             # result['tx_hash'] = tx_hash
-            logger.info(f"Parsed result: {json.dumps(result, indent=2)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Parsed result: %s", orjson.dumps(result).decode())
             
             return result
 
@@ -150,30 +305,56 @@ class UpdateProcessor:
                 "decision": "stop",
             }
 
-    @staticmethod
-    def _build_prompt(prompt: str, update: dict, author_name: str) -> str:
-        # Get base prompt from remote IPFS
-        response = requests.get(f"https://ipfs.index.network/files/{Config.PROMPT}")
-        basePrompt = response.text
-        return f""" {basePrompt}
+    # Constant prompt fragments built once at class load; _build_prompt joins
+    # them with the variable pieces so only the substitutions allocate per call
+    _PROMPT_HISTORY = """
 
 -------------------
 Here is the conversation history to check intent:
-- User: Show me {prompt} and nothing else.
+- User: Show me """
+    _PROMPT_CAST = """ and nothing else.
 -------------------
 New cast update to evaluate:
 
-Cast Text: {update['text']}
-Cast Link: {update['link']}
-Cast Author: [{author_name}](https://warpcast.com/{update['author']['username']})
+Cast Text: """
+    _PROMPT_LINK = "\nCast Link: "
+    _PROMPT_AUTHOR = "\nCast Author: ["
+    _PROMPT_AUTHOR_URL = "](https://warpcast.com/"
+    _PROMPT_FOOTER = """)
 
 Output response only in JSON format with the following structure:
-{{
+{
     "decision": "recommend" | "inappropriate" | "stop",
     "rationale": "explanation for the decision",
     "score": numeric_value,
     "message": "update message for the conversation"
-}}"""
+}"""
+
+    @staticmethod
+    def _build_prompt(prompt: str, update: dict, author_name: str) -> str:
+        # Get base prompt from remote IPFS (cached with a TTL)
+        basePrompt = _fetch_base_prompt(Config.PROMPT)
+        return UpdateProcessor._render_prompt(
+            basePrompt, prompt, update['text'], update['link'],
+            author_name, update['author']['username']
+        )
+
+    @staticmethod
+    @functools.lru_cache(maxsize=2048)
+    def _render_prompt(base: str, prompt: str, text: str, link: str,
+                       author_name: str, username: str) -> str:
+        """Join the full prompt from hashable pieces; memoized so the same
+        cast fanned out to multiple routers (or retried) reuses the rendered
+        string instead of rebuilding it."""
+        return ''.join((
+            ' ', base,
+            UpdateProcessor._PROMPT_HISTORY, prompt,
+            UpdateProcessor._PROMPT_CAST, text,
+            UpdateProcessor._PROMPT_LINK, link,
+            UpdateProcessor._PROMPT_AUTHOR, author_name,
+            UpdateProcessor._PROMPT_AUTHOR_URL, username,
+            UpdateProcessor._PROMPT_FOOTER
+        ))
 
     @staticmethod
     def _parse_response(response: str) -> dict:
@@ -183,163 +364,265 @@ Output response only in JSON format with the following structure:
             if "Here is the output:" in response:
                 response = response.split("Here is the output:")[-1].strip()
             
+            # Parse from a UTF-8 buffer: orjson consumes bytes natively, so
+            # encoding once here avoids a second conversion inside the parser
+            buf = response.encode()
+
             # Try parsing the response as-is first
             try:
-                return json.loads(response)
-            except json.JSONDecodeError:
-                # If that fails, try the cleanup approach
-                start_idx = response.find('{')
-                end_idx = response.rfind('}')
-                
-                if start_idx == -1 or end_idx == -1:
+                return orjson.loads(buf)
+            except orjson.JSONDecodeError:
+                # If that fails, extract the first balanced top-level object;
+                # unlike a crude first-{/last-} slice this survives trailing
+                # prose and braces inside string values
+                span = _find_json_span(buf)
+
+                if span is None:
                     raise ValueError("No valid JSON object found in response")
-                
-                # Extract everything between the first '{' and last '}'
-                json_str = response[start_idx:end_idx + 1]
-                return json.loads(json_str)
+
+                return orjson.loads(buf[span[0]:span[1]])
                 
         except Exception as e:
             logger.error(f"Failed to parse response: {response}")
             raise json.JSONDecodeError(f"Failed to parse response: {str(e)}", response, 0)
 
-# Initialize app and processor
+# Initialize app and processor; the LLM SDKs initialize lazily on first use
 app = Flask(__name__)
 processor = UpdateProcessor()
-og.init(email=Config.OG_EMAIL, password=Config.OG_PASSWORD, private_key=Config.OG_PRIVATE_KEY)
 
 # Add a global queue for updates
 update_queue = queue.Queue()
 
+# Shared pool for fanning LLM evaluations out across active routers; the
+# calls are I/O-bound so total wall time stays near one LLM round-trip
+LLM_POOL = ThreadPoolExecutor(max_workers=8)
+
+# Typed schema for the SSE payload covering only the fields we read; msgspec
+# decodes straight into these without building the full dict tree. The raw
+# payload is only fully parsed when a result is actually recommended.
+class CastAuthor(msgspec.Struct):
+    username: str = ''
+    name: str | None = None
+
+class CastNode(msgspec.Struct):
+    author: CastAuthor
+    text: str = ''
+    hash: str = ''
+
+class EventData(msgspec.Struct):
+    node: CastNode | None = None
+    channel: dict | None = None
+
+class UpdateEvent(msgspec.Struct):
+    data: EventData | None = None
+
+_EVENT_DECODER = msgspec.json.Decoder(UpdateEvent)
+
+# Seconds a router may go without its client draining the stream before
+# process_update expires it
+ROUTER_IDLE_TTL = 300
+
 @dataclass
 class RouterConfig:
     prompt: str
     queue: queue.Queue
     created_at: datetime
+    last_access: float
+    # Number of connected clients streaming this prompt; the entry is only
+    # removed on disconnect once this drops to zero
+    clients: int = 0
+
+async def process_update(raw_event: str | bytes) -> None:
+    """Process a raw SSE payload from the event stream."""
+    logger.debug("Processing new update: %s", raw_event)
 
-def process_update(updated_item: Dict[str, Any]) -> None:
-    """Process an update from the event stream."""
-    logger.info(f"Processing new update: {json.dumps(updated_item, indent=2)}")
-    
     try:
-        if not updated_item.get('data', {}).get('node'):
-            logger.warning(f"Rejected malformed request: {json.dumps(updated_item, indent=2)}")
+        try:
+            event = _EVENT_DECODER.decode(
+                raw_event.encode() if isinstance(raw_event, str) else raw_event
+            )
+        except msgspec.DecodeError as e:
+            logger.warning(f"Rejected malformed request: {str(e)}")
+            return
+
+        if not event.data or not event.data.node:
+            logger.warning(f"Rejected malformed request: missing data.node")
             return
 
-        cast = updated_item['data']['node']
-        # logger.info(f"Processing cast: {json.dumps(cast, indent=2)}")
-        cast['link'] = f"https://warpcast.com/{cast['author']['username']}/{cast['hash'][:12]}"
-        cast['channel_id'] = updated_item.get('data', {}).get('channel', {}).get('id')
+        node = event.data.node
+        cast = {
+            'author': {'name': node.author.name, 'username': node.author.username},
+            'text': node.text,
+            'hash': node.hash,
+            'link': f"https://warpcast.com/{node.author.username}/{node.hash[:12]}",
+            'channel_id': (event.data.channel or {}).get('id')
+        }
 
-        logger.info(f"Active routers: {list(processor.active_routers.keys())}")
-        for prompt, router_config in processor.active_routers.items():
-            logger.info(f"Processing for prompt: {prompt[:100]}")
+        logger.info("Active routers: %d", len(processor.active_routers))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Active router prompts: %s", list(processor.active_routers.keys()))
+
+        # Expire routers whose clients have stopped draining the stream, then
+        # snapshot under the lock and fan the evaluations out concurrently;
+        # each is an I/O-bound remote call so serial iteration would cost
+        # N x single-LLM-latency
+        now = time.monotonic()
+        with processor.routers_lock:
+            for stale_prompt in [
+                p for p, rc in processor.active_routers.items()
+                if now - rc.last_access > ROUTER_IDLE_TTL
+            ]:
+                del processor.active_routers[stale_prompt]
+                logger.info("Expired idle router for prompt: %.100s", stale_prompt)
+
+            routers = list(processor.active_routers.items())
+
+        # The evaluations still run on LLM_POOL (the SDK calls are sync), but
+        # awaiting them from the event loop keeps total wall time near the
+        # slowest single call
+        loop = asyncio.get_running_loop()
+        pending = [
+            (prompt, router_config,
+             loop.run_in_executor(LLM_POOL, processor.evaluate_update, router_config.prompt, cast))
+            for prompt, router_config in routers
+        ]
+
+        updated_item = None
+        for prompt, router_config, future in pending:
             try:
-                result = processor.evaluate_update(router_config.prompt, cast)
-                logger.info(f"Evaluation result: {json.dumps(result, indent=2)}")
-                
+                result = await future
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Evaluation result: %s", orjson.dumps(result).decode())
 
-                result['item'] = updated_item
-                
                 # If recommended, add to queue for routers
                 if result['decision'] == 'recommend':
+                    if updated_item is None:
+                        updated_item = orjson.loads(raw_event)
+                        # Re-apply the enrichment the typed decode no longer
+                        # does in place, so clients keep receiving
+                        # item.data.node.link and channel_id
+                        item_node = updated_item['data']['node']
+                        item_node['link'] = cast['link']
+                        item_node['channel_id'] = cast['channel_id']
+                    result['item'] = updated_item
                     router_config.queue.put(result)
-                    logger.info(f"Added recommended update to queue for prompt: {prompt[:100]}")
-                
+                    logger.info("Added recommended update to queue for prompt: %.100s", prompt)
+
             except Exception as e:
-                logger.error(f"Error processing update for prompt {prompt[:100]}: {str(e)}", exc_info=True)
+                logger.error("Error processing update for prompt %.100s: %s", prompt, str(e), exc_info=True)
 
     except Exception as e:
         logger.error(f"Error processing update: {str(e)}", exc_info=True)
 
-def router_thread(url: str):
-    """Separated router thread function with robust error handling and backoff"""
-    logger.info(f"Starting SSE router thread with URL: {url}")
+# Upper bound on the buffered SSE stream; exceeding it without a frame
+# separator aborts the connection so a reconnect restores clean framing
+_SSE_MAX_BUF = 4 * 1024 * 1024
+
+async def _iter_sse_events(content: aiohttp.StreamReader):
+    """Yield the data payload of each SSE event from an aiohttp stream.
+
+    Reads 64 KiB chunks, normalizes CR/CRLF line endings and splits frames
+    on the blank-line separator, avoiding per-line readline calls and their
+    length limit. Only data: lines are consumed downstream, so other SSE
+    fields (event:, id:, retry:) and comment lines are skipped.
+    """
+    buf = b''
+    eof = False
+    while not eof:
+        chunk = await content.read(65536)
+        eof = not chunk
+        buf += chunk
+
+        # Normalize CRLF/CR terminators to LF so the b'\n\n' separator
+        # matches every framing the spec allows; hold back a trailing CR
+        # whose LF may arrive in the next chunk (at EOF it is a real
+        # terminator, so the final frame still flushes)
+        held_cr = not eof and buf.endswith(b'\r')
+        if held_cr:
+            buf = buf[:-1]
+        buf = buf.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+
+        while (idx := buf.find(b'\n\n')) != -1:
+            frame = buf[:idx]
+            buf = buf[idx + 2:]
+            data = b'\n'.join(
+                line[5:].lstrip()
+                for line in frame.split(b'\n')
+                if line.startswith(b'data:')
+            )
+            if data:
+                yield data
+
+        if held_cr:
+            buf += b'\r'
+        if len(buf) > _SSE_MAX_BUF:
+            raise RuntimeError(
+                f"SSE buffer exceeded {_SSE_MAX_BUF} bytes without a frame separator"
+            )
+
+async def router_loop(url: str):
+    """Async SSE consumer with robust error handling and backoff"""
+    logger.info(f"Starting SSE router loop with URL: {url}")
     retry_count = 0
     max_retries = 5
     base_delay = 5  # Base delay in seconds
-    
-    while True:
-        try:
-            logger.info(f"Connecting to SSE stream... {url}")
-            headers = {
-                'Accept': 'text/event-stream',
-                'Connection': 'keep-alive'
-            }
-            
-            # Configure session with no read timeout
-            session = requests.Session()
-            session.keep_alive = False  # Disable keep-alive to prevent stale connections
-            
-            response = session.get(
-                url, 
-                headers=headers, 
-                stream=True,
-                timeout=(30, None)  # (connect timeout, read timeout=None for infinite)
-            )
-            response.raise_for_status()
-            
-            client = SSEClient(response.raw, char_enc='utf-8')
-            logger.info("Successfully connected to SSE stream")
-            
-            # Reset retry count on successful connection
-            retry_count = 0
-            
-            for event in client.events():
-                try:
-                    data = json.loads(event.data)
-                    logger.info(f"Received SSE data")
-                    process_update(data)
-                except json.JSONDecodeError as e:
-                    logger.error(f"Failed to parse SSE message: {str(e)}", exc_info=True)
-                    continue  # Continue to next event on parse error
-                except Exception as e:
-                    logger.error(f"Error handling message: {str(e)}", exc_info=True)
-                    continue  # Continue to next event on other errors
-                    
-        except (requests.exceptions.RequestException, TimeoutError) as e:
-            logger.error(f"SSE connection error, attempting reconnection: {str(e)}", exc_info=True)
-            
-            # Clean up resources
-            try:
-                response.close()
-                session.close()
-            except:
-                pass
-            
-            # Immediate retry for connection errors
-            continue
-            
-        except Exception as e:
-            retry_count += 1
-            delay = min(base_delay * (2 ** retry_count), 60)  # Exponential backoff, max 60 seconds
-            
-            logger.error(
-                f"Unexpected error (attempt {retry_count}/{max_retries}), "
-                f"retrying in {delay} seconds: {str(e)}", 
-                exc_info=True
-            )
-            
-            if retry_count >= max_retries:
-                logger.critical("Max retries reached, resetting retry count")
-                retry_count = 0
-            
-            # Clean up resources
+
+    # No total/read timeout: the stream stays open indefinitely
+    timeout = aiohttp.ClientTimeout(total=None, connect=30, sock_read=None)
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        while True:
             try:
-                response.close()
-                session.close()
-            except:
-                pass
-                
-            time.sleep(delay)  # Wait before retrying
+                logger.info(f"Connecting to SSE stream... {url}")
+                headers = {
+                    'Accept': 'text/event-stream',
+                    'Connection': 'keep-alive'
+                }
+
+                async with session.get(url, headers=headers) as response:
+                    response.raise_for_status()
+                    logger.info("Successfully connected to SSE stream")
+
+                    # Reset retry count on successful connection
+                    retry_count = 0
+
+                    async for data in _iter_sse_events(response.content):
+                        try:
+                            logger.info(f"Received SSE data")
+                            await process_update(data)
+                        except Exception as e:
+                            logger.error(f"Error handling message: {str(e)}", exc_info=True)
+                            continue  # Continue to next event on other errors
+
+            except (aiohttp.ClientError, asyncio.TimeoutError, TimeoutError) as e:
+                logger.error(f"SSE connection error, attempting reconnection: {str(e)}", exc_info=True)
+
+                # Immediate retry for connection errors
+                continue
+
+            except Exception as e:
+                retry_count += 1
+                delay = min(base_delay * (2 ** retry_count), 60)  # Exponential backoff, max 60 seconds
+
+                logger.error(
+                    f"Unexpected error (attempt {retry_count}/{max_retries}), "
+                    f"retrying in {delay} seconds: {str(e)}",
+                    exc_info=True
+                )
+
+                if retry_count >= max_retries:
+                    logger.critical("Max retries reached, resetting retry count")
+                    retry_count = 0
+
+                await asyncio.sleep(delay)  # Wait before retrying
 
 def start_router():
-    """Start the SSE router in a separate thread."""
+    """Start the SSE router loop on its own event loop thread."""
     logger.info("Initializing SSE router")
-    
+
     # Use Config variables instead of hardcoded values
     url = f"{Config.BASE_URL}/discovery/updates?sources[]={Config.SOURCE}"
-    
-    thread = threading.Thread(target=router_thread, args=(url,), daemon=True)
+
+    thread = threading.Thread(target=asyncio.run, args=(router_loop(url),), daemon=True)
     thread.start()
     return thread
 
@@ -354,27 +637,44 @@ def get_updates():
         return Response("Missing 'prompt' parameter", status=400)
 
     # Create new router configuration if doesn't exist
-    if prompt not in processor.active_routers:
-        processor.active_routers[prompt] = RouterConfig(
-            prompt=prompt,
-            queue=queue.Queue(),
-            created_at=datetime.now()
-        )
-    
-    router_config = processor.active_routers[prompt]
+    with processor.routers_lock:
+        if prompt not in processor.active_routers:
+            processor.active_routers[prompt] = RouterConfig(
+                prompt=prompt,
+                queue=queue.Queue(),
+                created_at=datetime.now(),
+                last_access=time.monotonic()
+            )
+
+        router_config = processor.active_routers[prompt]
+        router_config.clients += 1
 
     def generate():
-        while True:
-            try:
-                # Get update from queue specific to this prompt, timeout after 30 seconds
-                update = router_config.queue.get()
-                yield f"data: {json.dumps(update)}\n\n"
-            except queue.Empty:
-                # Send keepalive
-                yield ": keepalive\n\n"
-            except Exception as e:
-                logger.error(f"Error streaming update: {str(e)}")
-                continue
+        try:
+            while True:
+                router_config.last_access = time.monotonic()
+                try:
+                    # Get update from queue specific to this prompt; the
+                    # timeout makes the keepalive branch reachable so idle
+                    # connections are not reaped by proxies
+                    update = router_config.queue.get(timeout=15)
+                    yield b"data: " + orjson.dumps(update) + b"\n\n"
+                except queue.Empty:
+                    # Send keepalive
+                    yield b": keepalive\n\n"
+                except Exception as e:
+                    logger.error(f"Error streaming update: {str(e)}")
+                    continue
+        except GeneratorExit:
+            # Client disconnected; connections with the same prompt share one
+            # RouterConfig, so only drop the router once the last one is gone
+            with processor.routers_lock:
+                router_config.clients -= 1
+                if (router_config.clients <= 0
+                        and processor.active_routers.get(prompt) is router_config):
+                    del processor.active_routers[prompt]
+                    logger.info("Last client disconnected, removed router for prompt: %.100s", prompt)
+            raise
 
     return Response(
         stream_with_context(generate()),
@@ -382,7 +682,10 @@ def get_updates():
         headers={
             'Cache-Control': 'no-cache',
             'Connection': 'keep-alive'
-        }
+        },
+        # Pass the yielded bytes straight through to the socket without
+        # Werkzeug buffering or re-encoding the stream
+        direct_passthrough=True
     )
 
 def create_self_signed_cert_with_ra_tls():
@@ -501,5 +804,6 @@ if __name__ == '__main__':
     
     create_self_signed_cert_with_ra_tls()
     
-    # Run the Flask app
-    app.run(host='0.0.0.0', port=8000, ssl_context=("certificate.pem","private_key.pem"))
\ No newline at end of file
+    # Run the Flask app; threaded so each SSE client gets its own handler
+    # thread instead of one streaming response monopolizing the server
+    app.run(host='0.0.0.0', port=8000, threaded=True, ssl_context=("certificate.pem","private_key.pem"))
\ No newline at end of file